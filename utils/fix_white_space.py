@@ -5,9 +5,20 @@ Ensures output is exactly 1242 × 2688px by extending the background gradient
 """
 
 from PIL import Image
+import numpy as np
 import sys
 import os
 
+def _channel_medians(pixels):
+    """Per-channel median of an (N, 3) pixel array.
+
+    Uses np.partition (O(n) introselect) rather than a full sort, and takes
+    the lower middle element like the original sorted()-based code did.
+    """
+    mid = pixels.shape[0] // 2
+    return tuple(int(np.partition(pixels[:, c], mid)[mid]) for c in range(3))
+
+
 def remove_white_space(image_path, target_width=None, target_height=None):
     """Remove white space and ensure exact dimensions"""
     # Default to iPhone size if not specified
@@ -23,91 +34,79 @@ def remove_white_space(image_path, target_width=None, target_height=None):
     if img.mode != 'RGB':
         img = img.convert('RGB')
     
-    # Always ensure exact dimensions first
-    if width != target_width or height != target_height:
+    # Ensure exact dimensions first. If only the height is short, skip the
+    # LANCZOS resize - the background-fill path below extends the image
+    extend_only = (width == target_width and height < target_height)
+    dirty = False
+    if not extend_only and (width != target_width or height != target_height):
         img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-        img.save(image_path)
+        dirty = True
         print(f"     📐 Resized to {target_width} × {target_height}px")
-        # Reload after resize
-        img = Image.open(image_path)
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
         width, height = img.size
     
     # Find the last row with actual content (not white)
     # Search from bottom up, looking for where white space starts
     content_bottom = None
+
+    arr = np.asarray(img)
+
+    # Cheap guard: if the bottom row has any noticeably dark pixel there is
+    # no white strip to remove, so skip the full-image reductions entirely
+    if arr[-1].min() > 200:
+        # Per-row brightness and white-pixel ratio for the whole image at
+        # once, instead of crop + getdata + Python sums for every row
+        row_brightness = arr.mean(axis=(1, 2), dtype=np.float32)
+        white_mask = (arr[..., 0] > 250) & (arr[..., 1] > 250) & (arr[..., 2] > 250)
+        white_ratio = white_mask.mean(axis=1, dtype=np.float32)
+
+        # If bottom is white, find where content actually ends
+        if row_brightness[-1] > 240 or white_ratio[-1] > 0.8:
+            # Search up to 100 rows for the last row that is NOT white
+            # (content) - that's where we should extend from
+            search_top = max(0, height - 100)
+            is_content = (row_brightness < 240) & (white_ratio < 0.8)
+            content_rows = np.nonzero(is_content[search_top + 1:])[0]
+            if content_rows.size > 0:
+                content_bottom = search_top + 1 + int(content_rows[-1]) + 1
     
-    # Check if bottom row is white
-    bottom_row = img.crop((0, height - 1, width, height))
-    bottom_pixels = list(bottom_row.getdata())
-    bottom_avg = sum(sum(p) for p in bottom_pixels) / (len(bottom_pixels) * 3)
-    bottom_white = sum(1 for p in bottom_pixels if p[0] > 250 and p[1] > 250 and p[2] > 250)
-    bottom_white_ratio = bottom_white / len(bottom_pixels)
-    
-    # If bottom is white, find where content actually ends
-    if bottom_avg > 240 or bottom_white_ratio > 0.8:
-        # Search up to 100 rows to find content
-        for y in range(height - 1, max(0, height - 100), -1):
-            row = img.crop((0, y, width, y + 1))
-            row_pixels = list(row.getdata())
-            
-            avg_r = sum(p[0] for p in row_pixels) / len(row_pixels)
-            avg_g = sum(p[1] for p in row_pixels) / len(row_pixels)
-            avg_b = sum(p[2] for p in row_pixels) / len(row_pixels)
-            avg_brightness = (avg_r + avg_g + avg_b) / 3
-            
-            white_count = sum(1 for p in row_pixels if p[0] > 250 and p[1] > 250 and p[2] > 250)
-            white_ratio = white_count / len(row_pixels)
-            
-            # If this row is NOT white (content), this is where we should extend from
-            if avg_brightness < 240 and white_ratio < 0.8:
-                content_bottom = y + 1
-                break
-    
+    # A short image with no white strip still extends from its last row
+    if extend_only and content_bottom is None:
+        content_bottom = height
+
     # If we found white space, extend the image
     if content_bottom and content_bottom < target_height:
-        # Create new image
-        new_img = Image.new('RGB', (target_width, target_height))
-        
-        # Copy content
-        content_img = img.crop((0, 0, width, content_bottom))
-        new_img.paste(content_img, (0, 0))
-        
         # Sample background color from the last 20 rows of actual content
         sample_start = max(0, content_bottom - 20)
-        sample_area = img.crop((0, sample_start, width, content_bottom))
-        sample_pixels = list(sample_area.getdata())
-        
+        sample = arr[sample_start:content_bottom]
+
         # Get background pixels (exclude very bright and very dark)
-        bg_pixels = [p for p in sample_pixels if 50 < sum(p) < 600]
-        
-        if len(bg_pixels) > 50:
+        sums = sample.sum(axis=-1)
+        bg_pixels = sample[(sums > 50) & (sums < 600)]
+
+        if bg_pixels.shape[0] > 50:
             # Use median for robustness
-            all_r = sorted([p[0] for p in bg_pixels])
-            all_g = sorted([p[1] for p in bg_pixels])
-            all_b = sorted([p[2] for p in bg_pixels])
-            mid = len(all_r) // 2
-            bg_color = (all_r[mid], all_g[mid], all_b[mid])
+            bg_color = _channel_medians(bg_pixels)
         else:
             # Fallback: use median of all pixels
-            all_r = sorted([p[0] for p in sample_pixels])
-            all_g = sorted([p[1] for p in sample_pixels])
-            all_b = sorted([p[2] for p in sample_pixels])
-            mid = len(all_r) // 2
-            bg_color = (all_r[mid], all_g[mid], all_b[mid])
+            bg_color = _channel_medians(sample.reshape(-1, 3))
         
-        # Fill remaining space with background color
+        # Content on top, background fill below - assembled in a single
+        # output buffer rather than two Image.new + paste rounds
         fill_height = target_height - content_bottom
-        if fill_height > 0:
-            fill_img = Image.new('RGB', (target_width, fill_height), bg_color)
-            new_img.paste(fill_img, (0, content_bottom))
-            
-            new_img.save(image_path)
-            print(f"     ✂️  Removed {fill_height}px white space, extended to {target_width} × {target_height}px")
-            return True
+        out = np.empty((target_height, target_width, 3), dtype=np.uint8)
+        out[:content_bottom] = arr[:content_bottom]
+        out[content_bottom:] = bg_color
+
+        # Screenshots are intermediate pipeline files - zlib level 1 trades
+        # a slightly larger file for a much cheaper encode
+        Image.fromarray(out, 'RGB').save(image_path, 'PNG',
+                                         compress_level=1, optimize=False)
+        print(f"     ✂️  Removed {fill_height}px white space, extended to {target_width} × {target_height}px")
+        return True
     
-    # Already correct
+    # No white space to trim; persist the resize if one happened
+    if dirty:
+        img.save(image_path, 'PNG', compress_level=1, optimize=False)
     return False
 
 if __name__ == "__main__":